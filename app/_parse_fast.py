@@ -0,0 +1,73 @@
+"""Optional JIT-compiled header scanning for HTTPRequest.from_bytes.
+
+When Numba (and NumPy) are installed, the byte-level scan for line
+boundaries and colons runs as compiled machine code over a uint8 view of
+the request buffer instead of interpreter-level loops. The server does not
+depend on either package: if the import fails, `scan_header_lines` is None
+and the caller uses the pure-Python parser unchanged.
+"""
+
+from typing import List, Optional, Tuple
+
+# Upper bound on header lines the scanner will index; requests with more
+# fall back to the pure-Python parser
+MAX_HEADER_LINES = 128
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    np = None
+    scan_header_lines = None
+else:
+    @njit(cache=True, boundscheck=False)
+    def _scan(buf, out):  # pragma: no cover - requires numba
+        """Scans past the start line and indexes each header line.
+
+        Fills `out` rows with (line_start, colon, line_end) and returns
+        (line_count, body_start). line_count is -1 when `out` overflows.
+        """
+        n = buf.shape[0]
+        # Skip the start line (up to and including its CRLF)
+        pos = 0
+        while pos + 1 < n and not (buf[pos] == 13 and buf[pos + 1] == 10):
+            pos += 1
+        if pos + 1 >= n:
+            return 0, n
+        pos += 2
+
+        count = 0
+        while pos < n:
+            if pos + 1 < n and buf[pos] == 13 and buf[pos + 1] == 10:
+                # Blank line: headers end, body starts after it
+                return count, pos + 2
+            line_start = pos
+            colon = -1
+            while pos < n:
+                c = buf[pos]
+                if c == 58 and colon == -1:
+                    colon = pos
+                if c == 13 and pos + 1 < n and buf[pos + 1] == 10:
+                    break
+                pos += 1
+            if count >= out.shape[0]:
+                return -1, 0
+            out[count, 0] = line_start
+            out[count, 1] = colon
+            out[count, 2] = pos
+            count += 1
+            pos += 2  # Skip the CRLF (or run off the end)
+        return count, n
+
+    def scan_header_lines(request_bytes: bytes) -> Optional[Tuple[List[Tuple[int, int, int]], int]]:
+        """Returns ([(line_start, colon, line_end), ...], body_start) or None.
+
+        None means the scanner could not index the request (too many header
+        lines) and the caller should use the fallback parser.
+        """
+        buf = np.frombuffer(request_bytes, dtype=np.uint8)
+        out = np.empty((MAX_HEADER_LINES, 3), dtype=np.int64)
+        count, body_start = _scan(buf, out)
+        if count < 0:
+            return None
+        return [(int(out[i, 0]), int(out[i, 1]), int(out[i, 2])) for i in range(count)], body_start
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+from typing import Optional
+
+from .constants import (DEFAULT_ADDRESS, DEFAULT_PORT, MAX_REQUEST_SIZE,
+                        SOCKET_TIMEOUT)
+from .http_request import HTTPRequest
+from .http_response import HTTPResponse
+from .router import Router
+from .server import _content_length_of
+from .exceptions import (HTTPException, HTTPInternalServerError,
+                         HTTPPayloadTooLargeError)
+
+class AsyncHTTPServer:
+    """An asyncio-based HTTP/1.1 server supporting persistent connections.
+
+    A single event loop multiplexes all client sockets through the OS
+    selector (epoll/kqueue), so N concurrent keep-alive connections cost one
+    loop instead of N threads. Request parsing, routing, and response
+    building are shared with the threaded HTTPServer.
+    """
+
+    def __init__(self, host: str = DEFAULT_ADDRESS, port: int = DEFAULT_PORT,
+                 directory: Optional[str] = None, router: Optional[Router] = None):
+        """Initializes the async HTTP server.
+
+        Args:
+            host: The hostname or IP address to bind to.
+            port: The port number to bind to.
+            directory: The directory to serve files from (passed to handlers).
+            router: A Router instance. If None, a default router is created.
+        """
+        self.host = host
+        self.port = port
+        self.directory = directory
+        self.router = router if router is not None else Router()
+
+        if directory:
+            logging.info(f"Serving files from directory: {directory}")
+        else:
+            logging.warning("No --directory specified. File serving handlers might fail.")
+
+    async def _recv_request(self, reader: asyncio.StreamReader) -> bytes:
+        """Receives one complete HTTP request from the stream.
+
+        Mirrors HTTPServer._recv_request: read until the header terminator,
+        then read exactly Content-Length body bytes, so requests spanning
+        multiple TCP segments arrive whole. Returns b'' if the client
+        closed before sending anything.
+        """
+        try:
+            header_block = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            # EOF: hand back whatever arrived (may be a partial request)
+            return e.partial
+        except asyncio.LimitOverrunError:
+            raise HTTPPayloadTooLargeError("Request headers too large.")
+
+        content_length = _content_length_of(header_block[:-4])
+        if len(header_block) + content_length > MAX_REQUEST_SIZE:
+            raise HTTPPayloadTooLargeError("Request body too large.")
+        if content_length == 0:
+            return header_block
+        try:
+            body = await reader.readexactly(content_length)
+        except asyncio.IncompleteReadError as e:
+            body = e.partial # EOF mid-body; parser will see the truncated request
+        return header_block + body
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Handles a single client connection, potentially multiple requests."""
+        address = writer.get_extra_info("peername")
+        peername = f"{address[0]}:{address[1]}" if address else "unknown"
+        logging.debug("Connection established with %s", peername)
+
+        try:
+            while True: # Keep-Alive loop
+                response: Optional[HTTPResponse] = None
+                request: Optional[HTTPRequest] = None
+                close_connection = False
+
+                try:
+                    # Receive one complete request (bounded by the idle timeout)
+                    request_bytes = await asyncio.wait_for(
+                        self._recv_request(reader), timeout=SOCKET_TIMEOUT
+                    )
+                    if not request_bytes:
+                        logging.debug("Client %s closed connection.", peername)
+                        break # Client closed connection gracefully
+
+                    # Parse the request
+                    request = HTTPRequest.from_bytes(request_bytes)
+                    logging.debug("Received request from %s: %s %s", peername, request.method.value, request.path)
+
+                    # Determine if connection should close after this request
+                    close_connection = request.should_close_connection
+
+                    # Find the appropriate handler using the router
+                    handler = self.router.find_handler(request)
+
+                    # Handlers do blocking work (file I/O, gzip); run them on
+                    # the default executor so they cannot stall the event loop
+                    loop = asyncio.get_running_loop()
+                    response = await loop.run_in_executor(
+                        None, handler, request, self.directory)
+
+                except asyncio.TimeoutError:
+                    logging.warning(f"Connection to {peername} timed out.")
+                    close_connection = True
+                    break
+                except (ConnectionResetError, BrokenPipeError):
+                    logging.warning(f"Connection to {peername} reset by peer.")
+                    close_connection = True
+                    break
+                except HTTPException as e:
+                    # Handle known HTTP errors from parsing or handlers
+                    logging.warning(f"HTTP error for {peername}: {e}")
+                    response = HTTPResponse(status_code=e.status_code, body=e.message)
+                    # Close on server errors and on unrecoverable framing
+                    # (413: the over-limit bytes are still in the stream
+                    # buffer and would be re-rejected forever)
+                    close_connection = (close_connection or e.must_close
+                                        or e.status_code.value >= 500)
+                except Exception as e:
+                    # Handle unexpected errors
+                    logging.exception(f"Unexpected error processing request from {peername}: {e}")
+                    err_resp = HTTPInternalServerError()
+                    response = HTTPResponse(status_code=err_resp.status_code, body=err_resp.message)
+                    close_connection = True # Always close on unexpected server errors
+
+                # Send the response if one was generated
+                if response:
+                    try:
+                        # Each response type knows its own send strategy
+                        # (separate header/body writes, loop.sendfile, or a
+                        # frozen blob), mirroring write_to on the socket path
+                        await response.write_to_stream(
+                            writer, close_connection=close_connection)
+                    except (ConnectionError, OSError) as e:
+                        # Peer vanished mid-send; previously this escaped
+                        # _handle_client as an unhandled callback exception
+                        logging.warning("Send to %s failed: %s", peername, e)
+                        break
+                    logging.debug("Sent response to %s: %s %s", peername, response.status_code.value, response.status_text)
+                elif not close_connection:
+                    logging.warning(f"No response generated for {peername}, but connection not marked for closure. Closing.")
+                    close_connection = True
+
+                # Close connection if flagged
+                if close_connection:
+                    logging.debug("Closing connection to %s.", peername)
+                    break
+
+        finally:
+            if not writer.is_closing():
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except (ConnectionResetError, BrokenPipeError):
+                    pass # Peer already gone
+            logging.debug("Socket for %s closed.", peername)
+
+    async def _serve(self):
+        """Creates the asyncio server and runs it until cancelled."""
+        # limit must cover MAX_REQUEST_SIZE: the default 64 KiB stream
+        # limit would cap headers far below what the threaded backend takes
+        server = await asyncio.start_server(
+            self._handle_client, self.host, self.port, reuse_port=True,
+            limit=MAX_REQUEST_SIZE
+        )
+        logging.info(f"Server started on {self.host}:{self.port} (asyncio backend)")
+        async with server:
+            await server.serve_forever()
+
+    def start(self):
+        """Starts the event loop and serves until interrupted."""
+        try:
+            asyncio.run(self._serve())
+        except OSError as e:
+            logging.error(f"Failed to start server on {self.host}:{self.port}: {e}")
+        except KeyboardInterrupt:
+            logging.info("Server shutting down due to KeyboardInterrupt...")
+        logging.info("Server stopped.")
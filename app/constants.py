@@ -10,6 +10,10 @@ class HTTPMethod(StrEnum):
     OPTIONS = "OPTIONS"
     PATCH = "PATCH"
 
+# Wire-format method lookup: two dict probes beat the enum constructor
+# (with its _missing_ machinery and exception setup) on every request
+METHOD_TABLE = {m.value.encode('ascii'): m for m in HTTPMethod}
+
 # HTTP Status Codes
 class HTTPStatus(IntEnum):
     # 1xx Informational
@@ -60,6 +64,7 @@ STATUS_TEXT = {
     HTTPStatus.INTERNAL_SERVER_ERROR: "Internal Server Error",
     HTTPStatus.BAD_REQUEST: "Bad Request",
     HTTPStatus.METHOD_NOT_ALLOWED: "Method Not Allowed",
+    HTTPStatus.PAYLOAD_TOO_LARGE: "Payload Too Large",
 }
 
 # Common Header Names (case-insensitive, but canonical form is good practice)
@@ -73,6 +78,16 @@ class HTTPHeader(StrEnum):
     HOST = "Host"
     LOCATION = "Location"
 
+# Static header-name caches built once at import time. Parsing and lookup
+# code consults these so the fixed set of well-known headers reuses a single
+# interned key object instead of allocating fresh lowercased strings/bytes
+# per request.
+CANONICAL_HEADER_LOWER = {h.value.lower(): h.value for h in HTTPHeader}
+CANONICAL_HEADER_BYTES = {k.encode('ascii'): v for k, v in CANONICAL_HEADER_LOWER.items()}
+# Maps a lowercased bytes name to its interned singleton (identity-comparable
+# dict key for downstream lookups)
+INTERNED_HEADER_KEYS = {k: k for k in CANONICAL_HEADER_BYTES}
+
 # Common Content Types
 class ContentType(StrEnum):
     TEXT_PLAIN = "text/plain"
@@ -86,4 +101,18 @@ PROTOCOL_VERSION = "HTTP/1.1"
 DEFAULT_PORT = 4221
 DEFAULT_ADDRESS = "localhost"
 SOCKET_TIMEOUT = 10 # seconds
-RECV_BUFFER_SIZE = 2048 
\ No newline at end of file
+# Upper bound on concurrent connection-handling threads (bounds memory and
+# amortizes thread creation versus one fresh thread per accept)
+DEFAULT_MAX_WORKERS = 64
+# Initial per-connection receive buffer; 16 KiB lets a sizeable POST body
+# land in one recv_into without buffer doubling, and the buffer is reused
+# across a connection's requests so the cost is paid once
+RECV_BUFFER_SIZE = 16384
+# Hard cap on a single request (headers + body); larger requests get a 413
+MAX_REQUEST_SIZE = 1024 * 1024
+# Bodies below one MTU are sent uncompressed: they fit in a single segment
+# anyway, so gzip would burn CPU without saving a packet
+GZIP_MIN_SIZE = 1400
+# Files at or above this size are streamed with sendfile; smaller ones are
+# read in a single os.read and sent inline with the headers
+SENDFILE_MIN_SIZE = 32 * 1024 
\ No newline at end of file
@@ -2,9 +2,14 @@ from .constants import HTTPStatus, STATUS_TEXT
 
 class HTTPException(Exception):
     """Base class for HTTP related exceptions."""
-    def __init__(self, status_code: HTTPStatus, message: str | None = None):
+    def __init__(self, status_code: HTTPStatus, message: str | None = None,
+                 must_close: bool = False):
         self.status_code = status_code
         self.message = message or STATUS_TEXT.get(status_code, "Unknown Error")
+        # True when the connection cannot outlive this error (e.g. request
+        # framing was abandoned mid-stream and resynchronization is
+        # impossible); the connection loops close after responding
+        self.must_close = must_close
         super().__init__(f"{self.status_code} {self.message}")
 
 class HTTPBadRequestError(HTTPException):
@@ -27,6 +32,16 @@ class HTTPMethodNotAllowedError(HTTPException):
     def __init__(self, message: str | None = None):
         super().__init__(HTTPStatus.METHOD_NOT_ALLOWED, message)
 
+class HTTPPayloadTooLargeError(HTTPException):
+    """Exception for 413 Payload Too Large.
+
+    Always closes the connection: the oversized request was never read to
+    completion, so the bytes that follow are the middle of the rejected
+    request and cannot be reframed as a new one.
+    """
+    def __init__(self, message: str | None = None):
+        super().__init__(HTTPStatus.PAYLOAD_TOO_LARGE, message, must_close=True)
+
 class HTTPInternalServerError(HTTPException):
     """Exception for 500 Internal Server Error."""
     def __init__(self, message: str | None = None):
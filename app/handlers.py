@@ -1,72 +1,174 @@
-# Will be populated later 
-
+import errno
+import functools
+import logging
 import os
-import gzip
-from typing import Optional
+import re
+import stat
+import zlib
+from typing import Optional, Tuple
 
 from .http_request import HTTPRequest
-from .http_response import HTTPResponse
-from .constants import HTTPStatus, HTTPHeader, ContentType
+from .http_response import (HTTPResponse, FileResponse, PlainTextResponse,
+                            PrecomputedResponse)
+from .constants import (HTTPStatus, HTTPHeader, ContentType, GZIP_MIN_SIZE,
+                        SENDFILE_MIN_SIZE)
 from .exceptions import HTTPNotFoundError, HTTPForbiddenError, HTTPInternalServerError
 
 # Type alias for cleaner handler signatures
 # HandlerFunction = Callable[[HTTPRequest, Optional[str]], HTTPResponse]
 
+# Constant responses rendered once at import time; the handlers below hand
+# these shared frozen instances back instead of rebuilding identical bytes
+# per request
+_RESPONSE_OK_EMPTY = PrecomputedResponse(status_code=HTTPStatus.OK)
+_RESPONSE_NOT_FOUND = PrecomputedResponse(status_code=HTTPStatus.NOT_FOUND, body="Resource not found.")
+
 def handle_root(request: HTTPRequest, directory: Optional[str]) -> HTTPResponse:
     """Handles requests to the root path ('/')."""
     # Currently returns a simple 200 OK with no body
-    return HTTPResponse(status_code=HTTPStatus.OK)
+    return _RESPONSE_OK_EMPTY
+
+@functools.lru_cache(maxsize=8)
+def _resolve_base_dir(directory: str) -> Tuple[str, str]:
+    """Resolves the serving directory once and caches the result.
+
+    The configured directory never changes while the server runs, so the
+    getcwd()-and-readlink-backed canonicalization should not be repeated
+    per request. realpath (rather than abspath) also resolves symlinks in
+    the configured root, so the containment check compares against the
+    directory's true location. Returns (base, base + os.sep); the
+    separator-suffixed form makes the check immune to prefix-substring
+    matches (e.g. '/tmp/foo' passing a check against '/tmp/f').
+    """
+    base = os.path.realpath(directory)
+    return base, base + os.sep
+
+@functools.lru_cache(maxsize=8)
+def _dir_fd_of(base_dir: str) -> int:
+    """Opens the serving root as a directory fd, once per configured root.
+
+    File opens resolve their relative path against this fd in the kernel
+    (openat), so the per-request join of root + relative path and the
+    getcwd-backed canonicalization of the result disappear from the hot
+    path. The fd lives for the process lifetime, like the cache entry.
+    """
+    return os.open(base_dir, os.O_RDONLY | os.O_DIRECTORY)
+
+@functools.lru_cache(maxsize=1024)
+def _normalize_relative_path(relative_file_path: str) -> Optional[str]:
+    """Normalizes a client-supplied relative path; None means rejected.
+
+    With opens anchored to the root's dir_fd, containment only requires
+    that the normalized path is relative and does not start with a '..'
+    component; anything else cannot leave the root (O_NOFOLLOW on the
+    open additionally refuses a symlinked final component). Popular
+    paths repeat across requests, so the normpath walk is memoized;
+    rejection is signalled by value rather than exception because
+    lru_cache does not cache raises.
+    """
+    rel = os.path.normpath(relative_file_path)
+    if rel.startswith(os.sep) or rel == ".." or rel.startswith(".." + os.sep):
+        return None
+    return rel
+
+def _validate_relative_path(relative_file_path: str) -> str:
+    """Normalizes a client-supplied relative path and rejects escapes."""
+    rel = _normalize_relative_path(relative_file_path)
+    if rel is None:
+        raise HTTPForbiddenError("Access denied to file path.")
+    return rel
+
+# Matches a standalone gzip token (with optional q-value) in Accept-Encoding.
+# One C-level scan over the raw header bytes, versus splitting the value and
+# stripping each token per request; anchoring on , and ; also avoids the
+# false positive on e.g. "x-gzip" that a substring test would give.
+_GZIP_RE = re.compile(rb"(?:^|,)\s*gzip\s*(?:$|,|;)", re.IGNORECASE)
+@functools.lru_cache(maxsize=1024)
+def _gzip_compress(data: bytes) -> bytes:
+    """Compresses data into the gzip container format.
+
+    Uses zlib.compressobj(wbits=31) directly rather than gzip.compress,
+    which wraps every call in a fresh GzipFile + BytesIO pair with a tiny
+    internal buffer. Level 1 trades a little ratio for roughly 4x less CPU
+    per byte, the right side of that trade for latency-bound responses.
+    Echo bodies are deterministic in the path, so the LRU cache turns
+    repeated requests for the same path into a dict hit.
+    """
+    compressor = zlib.compressobj(level=1, wbits=31)
+    return compressor.compress(data) + compressor.flush()
 
 def handle_echo(request: HTTPRequest, directory: Optional[str]) -> HTTPResponse:
     """Handles requests to '/echo/...' paths."""
-    echo_str = request.path[len("/echo/"):]
-    response_body = echo_str.encode('utf-8')
-    headers = {HTTPHeader.CONTENT_TYPE: ContentType.TEXT_PLAIN}
-
-    # Check for gzip compression
-    accept_encoding = request.get_header(HTTPHeader.ACCEPT_ENCODING, "")
-    if "gzip" in [enc.strip() for enc in accept_encoding.split(",")]:
-        response_body = gzip.compress(response_body)
-        headers[HTTPHeader.CONTENT_ENCODING] = "gzip"
-
-    # Content-Length will be set automatically by HTTPResponse
-    return HTTPResponse(status_code=HTTPStatus.OK, headers=headers, body=response_body)
+    # Slice the undecoded path bytes: the echo body is exactly what was on
+    # the wire, so there is no str slice + re-encode round trip
+    response_body = request.raw_path[len(b"/echo/"):]
+
+    # Check for gzip compression on the raw header bytes (no decode/split).
+    # Bodies under one MTU ship uncompressed: compressing them costs CPU
+    # without saving a packet, and framing overhead can even grow them.
+    if len(response_body) >= GZIP_MIN_SIZE:
+        accept_encoding = request.get_header_bytes(HTTPHeader.ACCEPT_ENCODING)
+        if accept_encoding and _GZIP_RE.search(accept_encoding):
+            headers = {HTTPHeader.CONTENT_TYPE: ContentType.TEXT_PLAIN,
+                       HTTPHeader.CONTENT_ENCODING: "gzip"}
+            return HTTPResponse.from_body_bytes(
+                HTTPStatus.OK, headers=headers, body=_gzip_compress(response_body))
+
+    # Common case: identity-encoded text, served via the header template
+    return PlainTextResponse(response_body)
 
 def handle_user_agent(request: HTTPRequest, directory: Optional[str]) -> HTTPResponse:
     """Handles requests to '/user-agent'."""
-    user_agent = request.get_header(HTTPHeader.USER_AGENT, "Unknown")
-    headers = {HTTPHeader.CONTENT_TYPE: ContentType.TEXT_PLAIN}
-    # Content-Length will be set automatically by HTTPResponse
-    return HTTPResponse(status_code=HTTPStatus.OK, headers=headers, body=user_agent)
+    user_agent = request.get_header_bytes(HTTPHeader.USER_AGENT, b"Unknown")
+    return PlainTextResponse(user_agent)
 
 def handle_file_get(request: HTTPRequest, directory: Optional[str]) -> HTTPResponse:
     """Handles GET requests to '/files/...'."""
     if not directory:
         raise HTTPInternalServerError("File directory not configured on server.")
 
-    relative_file_path = request.path[len("/files/"):]
-    full_file_path = os.path.abspath(os.path.join(directory, relative_file_path))
+    rel_path = _validate_relative_path(request.path[len("/files/"):])
+    base_dir, _ = _resolve_base_dir(directory)
+    dir_fd = _dir_fd_of(base_dir)
 
-    # Security check: Ensure the path is still within the configured directory
-    if not full_file_path.startswith(os.path.abspath(directory)):
-        raise HTTPForbiddenError("Access denied to file path.")
-
-    if not os.path.exists(full_file_path):
-        raise HTTPNotFoundError(f"File not found: {relative_file_path}")
+    # One stat answers existence, type, and size; the exists/isfile/getsize
+    # trio would cost three stat syscalls for the same information. The
+    # kernel resolves rel_path against the root's dir_fd (openat-style).
+    try:
+        st = os.stat(rel_path, dir_fd=dir_fd)
+    except (FileNotFoundError, NotADirectoryError):
+        raise HTTPNotFoundError(f"File not found: {rel_path}")
 
-    if not os.path.isfile(full_file_path):
-        # Do not serve directories
-        raise HTTPNotFoundError(f"Path is not a file: {relative_file_path}")
+    if not stat.S_ISREG(st.st_mode):
+        # Do not serve directories (or devices, sockets, ...)
+        raise HTTPNotFoundError(f"Path is not a file: {rel_path}")
 
     try:
-        with open(full_file_path, "rb") as f:
-            file_data = f.read()
+        size = st.st_size
         headers = {HTTPHeader.CONTENT_TYPE: ContentType.APP_OCTET_STREAM}
-        # Content-Length will be set automatically by HTTPResponse
-        return HTTPResponse(status_code=HTTPStatus.OK, headers=headers, body=file_data)
-    except IOError as e:
-        # Log the error ideally
-        print(f"Error reading file '{full_file_path}': {e}") # Replace with logging
+        if size < SENDFILE_MIN_SIZE:
+            # Small file: one unbuffered read (os.open/os.read skips the
+            # BufferedReader wrapper a plain open() would interpose);
+            # O_NOFOLLOW refuses a symlinked final component
+            fd = os.open(rel_path, os.O_RDONLY | os.O_NOFOLLOW, dir_fd=dir_fd)
+            try:
+                file_data = os.read(fd, size)
+            finally:
+                os.close(fd)
+            return HTTPResponse.from_body_bytes(HTTPStatus.OK, headers=headers, body=file_data)
+        # Large file: open now, anchored to the dir_fd like the small-file
+        # path; the body is spliced from this fd at send time (sendfile),
+        # so the contents never pass through a Python buffer
+        fd = os.open(rel_path, os.O_RDONLY | os.O_NOFOLLOW, dir_fd=dir_fd)
+        return FileResponse(status_code=HTTPStatus.OK,
+                            file_path=os.path.join(base_dir, rel_path),
+                            size=size, headers=headers, fd=fd)
+    except OSError as e:
+        if e.errno == errno.ELOOP:
+            # O_NOFOLLOW refusing a symlinked final component: an expected
+            # client-triggered rejection, not a server fault
+            raise HTTPNotFoundError(f"File not found: {rel_path}")
+        logging.error("Error reading file '%s/%s': %s", base_dir, rel_path, e)
         raise HTTPInternalServerError("Error reading file.")
 
 def handle_file_post(request: HTTPRequest, directory: Optional[str]) -> HTTPResponse:
@@ -74,34 +176,40 @@ def handle_file_post(request: HTTPRequest, directory: Optional[str]) -> HTTPResp
     if not directory:
         raise HTTPInternalServerError("File directory not configured on server.")
 
-    relative_file_path = request.path[len("/files/"):]
-    full_file_path = os.path.abspath(os.path.join(directory, relative_file_path))
-
-    # Security check
-    if not full_file_path.startswith(os.path.abspath(directory)):
-        raise HTTPForbiddenError("Access denied to file path.")
+    rel_path = _validate_relative_path(request.path[len("/files/"):])
+    base_dir, _ = _resolve_base_dir(directory)
+    dir_fd = _dir_fd_of(base_dir)
 
-    if not request.body:
-        # Depending on requirements, maybe return 400 Bad Request if body is needed
-        body_bytes = b""
-    else:
-        body_bytes = request.body.encode('utf-8') # Assuming body is text
+    # Write the wire bytes straight through: decoding to str and re-encoding
+    # would cost two full passes over the body and reject binary uploads
+    body_bytes = request.body_bytes or b""
 
     try:
-        # Ensure parent directory exists
-        os.makedirs(os.path.dirname(full_file_path), exist_ok=True)
-        with open(full_file_path, "wb") as f:
-            f.write(body_bytes)
+        # Ensure parent directory exists (makedirs has no dir_fd support;
+        # rel_path is already validated as contained)
+        parent = os.path.dirname(rel_path)
+        if parent:
+            os.makedirs(os.path.join(base_dir, parent), exist_ok=True)
+        # Single unbuffered write anchored to the root's dir_fd; no
+        # BufferedWriter is needed for one shot
+        fd = os.open(rel_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_NOFOLLOW,
+                     0o644, dir_fd=dir_fd)
+        try:
+            os.write(fd, body_bytes)
+        finally:
+            os.close(fd)
 
         # Standard practice for 201 Created is often no body or just a Location header
         # Here, returning empty body.
         return HTTPResponse(status_code=HTTPStatus.CREATED, body=b"")
 
     except IOError as e:
-        # Log the error ideally
-        print(f"Error writing file '{full_file_path}': {e}") # Replace with logging
+        if e.errno == errno.ELOOP:
+            # Refuse to write through a symlinked final component
+            raise HTTPForbiddenError("Access denied to file path.")
+        logging.error("Error writing file '%s/%s': %s", base_dir, rel_path, e)
         raise HTTPInternalServerError("Error writing file.")
 
 def handle_not_found(request: HTTPRequest, directory: Optional[str]) -> HTTPResponse:
     """Default handler for unmatched routes (404 Not Found)."""
-    return HTTPResponse(status_code=HTTPStatus.NOT_FOUND, body="Resource not found.") 
\ No newline at end of file
+    return _RESPONSE_NOT_FOUND 
\ No newline at end of file
@@ -1,73 +1,249 @@
-from typing import Dict, Optional
-from .constants import HTTPMethod, CRLF, HTTPHeader
+from functools import lru_cache
+from typing import Dict, Optional, Union
+from .constants import HTTPMethod, INTERNED_HEADER_KEYS, METHOD_TABLE
 from .exceptions import HTTPBadRequestError
+from ._parse_fast import scan_header_lines
+
+try:
+    # Optional C parser (llhttp bindings); the pure-Python path below is
+    # the fallback and the reference implementation
+    import httptools
+except ImportError:
+    httptools = None
+
+
+@lru_cache(maxsize=64)
+def _normalize_header_name(name: str) -> bytes:
+    """Lowercases and encodes a header name, memoized per distinct name.
+
+    Lookup sites pass a small fixed set of names (mostly HTTPHeader members),
+    so the cache turns the per-call lower()+encode() into a dict hit.
+    """
+    return name.lower().encode('ascii')
+
+# Byte-level framing constants (parsing never decodes the full request)
+CRLF_BYTES = b"\r\n"
+HEADER_END = b"\r\n\r\n"
+
+
+class _HttptoolsCollector:
+    """Callback sink for httptools.HttpRequestParser.
+
+    The C parser walks the buffer and hands back url/header/body slices;
+    this object just records them in the shapes from_bytes needs.
+    """
+
+    __slots__ = ("url", "headers", "body_parts", "headers_complete")
+
+    def __init__(self):
+        self.url: Optional[bytes] = None
+        self.headers: Dict[bytes, bytes] = {}
+        self.body_parts: list = []
+        self.headers_complete = False
+
+    def on_url(self, url: bytes):
+        self.url = url
+
+    def on_header(self, name: bytes, value: bytes):
+        key = name.lower()
+        key = INTERNED_HEADER_KEYS.get(key, key)
+        self.headers[key] = value
+
+    def on_headers_complete(self):
+        self.headers_complete = True
+
+    def on_body(self, body: bytes):
+        self.body_parts.append(body)
 
 class HTTPRequest:
-    """Represents a parsed HTTP request."""
+    """Represents a parsed HTTP request.
+
+    Parsing operates directly on the raw request bytes in a single forward
+    pass; header names/values are stored as bytes and only decoded when a
+    caller asks for them, avoiding a full-buffer UTF-8 decode and the
+    per-header str allocations of a split-based parser.
+    """
 
     def __init__(self,
                  method: HTTPMethod,
                  path: str,
-                 headers: Dict[str, str],
-                 body: str | None = None,
-                 protocol: str = "HTTP/1.1"):
+                 headers: Dict[bytes, bytes],
+                 body: Union[str, bytes, None] = None,
+                 protocol: str = "HTTP/1.1",
+                 raw_path: Optional[bytes] = None):
         """Initializes an HTTPRequest object."""
         self.method = method
         self.path = path
+        # Undecoded path slice from the wire; handlers that answer with a
+        # piece of the path (echo) can slice this instead of re-encoding
+        self.raw_path = raw_path if raw_path is not None else path.encode('latin-1')
         self.protocol = protocol
-        self.headers = headers # Headers are stored case-insensitively (normalized to lower)
-        self.body = body
+        self.headers = headers # Keys are lowercased header names as bytes
+        if isinstance(body, str):
+            self._body_bytes: Optional[bytes] = body.encode('utf-8')
+            self._body_text: Optional[str] = body
+        else:
+            self._body_bytes = body
+            self._body_text = None
+        # Decoded header values, filled on demand by get_header
+        self._decoded_headers: Dict[bytes, str] = {}
+
+    @classmethod
+    def _from_bytes_httptools(cls, request_bytes: bytes) -> Optional["HTTPRequest"]:
+        """Parses with the optional llhttp C parser.
+
+        Returns None when the buffer cannot be handled confidently (parse
+        error, truncated headers, unknown method) so the caller falls back
+        to the native parser, which owns the error diagnostics.
+        """
+        collector = _HttptoolsCollector()
+        parser = httptools.HttpRequestParser(collector)
+        try:
+            parser.feed_data(request_bytes)
+        except httptools.HttpParserError:
+            return None
+        if not collector.headers_complete or collector.url is None:
+            return None
+        method = METHOD_TABLE.get(parser.get_method())
+        if method is None:
+            return None
+        return cls(method=method,
+                   path=collector.url.decode('latin-1'),
+                   headers=collector.headers,
+                   body=b"".join(collector.body_parts),
+                   protocol=f"HTTP/{parser.get_http_version()}",
+                   raw_path=collector.url)
 
     @classmethod
     def from_bytes(cls, request_bytes: bytes) -> "HTTPRequest":
         """Parses raw request bytes into an HTTPRequest object."""
-        try:
-            request_text = request_bytes.decode('utf-8')
-        except UnicodeDecodeError:
-            raise HTTPBadRequestError("Invalid encoding in request")
+        if not request_bytes:
+            raise HTTPBadRequestError("Empty request")
 
-        # Split headers and body
-        header_part, body = request_text.split(CRLF + CRLF, 1) if CRLF + CRLF in request_text else (request_text, "")
+        if httptools is not None:
+            request = cls._from_bytes_httptools(request_bytes)
+            if request is not None:
+                return request
 
-        request_lines = header_part.split(CRLF)
-        if not request_lines:
-            raise HTTPBadRequestError("Empty request")
+        # Let the optional JIT scanner index header lines in compiled code;
+        # it returns None (or is None) when the pure-Python walk must run
+        scanned = scan_header_lines(request_bytes) if scan_header_lines is not None else None
+
+        if scanned is not None:
+            line_offsets, body_start = scanned
+            header_block = request_bytes[:body_start]
+            body = request_bytes[body_start:]
+        else:
+            # Split headers and body without decoding anything
+            header_end = request_bytes.find(HEADER_END)
+            if header_end == -1:
+                header_block = request_bytes
+                body = b""
+            else:
+                header_block = request_bytes[:header_end]
+                body = request_bytes[header_end + len(HEADER_END):]
 
         # Parse start line (Method Path Protocol)
-        start_line = request_lines[0]
+        eol = header_block.find(CRLF_BYTES)
+        start_line = header_block if eol == -1 else header_block[:eol]
         try:
-            method_str, path, protocol = start_line.split(" ", 2)
+            method_bytes, path_bytes, protocol_bytes = start_line.split(b" ", 2)
         except ValueError:
             raise HTTPBadRequestError(f"Malformed start line: {start_line!r}")
 
-        try:
-            method = HTTPMethod(method_str.upper())
-        except ValueError:
-            # If method is not in our enum, treat as bad request or potentially extend enum
-            raise HTTPBadRequestError(f"Unsupported HTTP method: {method_str}")
-
-        # Parse headers
-        headers: Dict[str, str] = {}
-        for line in request_lines[1:]:
-            if line == "": # Should not happen before CRLFCRLF, but handle defensively
-                break
-            if ":" in line:
-                key, value = line.split(":", 1)
-                # Normalize header keys to lowercase for consistent access
-                headers[key.strip().lower()] = value.strip()
-            else:
-                raise HTTPBadRequestError(f"Malformed header line: {line!r}")
+        # Fast path hits on the canonical uppercase spelling; the second
+        # probe tolerates lowercased methods without penalizing it
+        method = METHOD_TABLE.get(method_bytes) or METHOD_TABLE.get(method_bytes.upper())
+        if method is None:
+            raise HTTPBadRequestError(f"Unsupported HTTP method: {method_bytes!r}")
 
-        return cls(method=method, path=path, headers=headers, body=body, protocol=protocol)
+        # Parse headers: one pass, bytes-keyed dict, values kept as bytes
+        headers: Dict[bytes, bytes] = {}
+        if scanned is not None:
+            for line_start, colon, line_end in line_offsets:
+                if colon == -1:
+                    raise HTTPBadRequestError(
+                        f"Malformed header line: {request_bytes[line_start:line_end]!r}")
+                key = request_bytes[line_start:colon].lower()
+                key = INTERNED_HEADER_KEYS.get(key, key)
+                headers[key] = request_bytes[colon + 1:line_end].strip()
+        else:
+            pos = eol + 2 if eol != -1 else len(header_block)
+            block_len = len(header_block)
+            while pos < block_len:
+                eol = header_block.find(CRLF_BYTES, pos)
+                if eol == -1:
+                    eol = block_len
+                if eol == pos: # Should not happen before CRLFCRLF, but handle defensively
+                    break
+                # Index into the block directly: slicing out a `line` first
+                # would cost an extra bytes object per header
+                colon = header_block.find(b":", pos, eol)
+                if colon == -1:
+                    raise HTTPBadRequestError(
+                        f"Malformed header line: {header_block[pos:eol]!r}")
+                # Normalize header names to lowercase; spec forbids whitespace
+                # around the name, so only the value needs trimming. Well-known
+                # names are swapped for their interned singleton so later dict
+                # probes compare by identity.
+                key = header_block[pos:colon].lower()
+                key = INTERNED_HEADER_KEYS.get(key, key)
+                headers[key] = header_block[colon + 1:eol].strip()
+                pos = eol + 2
+
+        # Path and protocol are small and always needed; decode them eagerly
+        path = path_bytes.decode('latin-1')
+        protocol = protocol_bytes.decode('latin-1')
+
+        return cls(method=method, path=path, headers=headers, body=body,
+                   protocol=protocol, raw_path=path_bytes)
+
+    @property
+    def body(self) -> Optional[str]:
+        """The request body decoded as UTF-8 (lazily, on first access)."""
+        if self._body_text is None and self._body_bytes:
+            try:
+                self._body_text = self._body_bytes.decode('utf-8')
+            except UnicodeDecodeError:
+                raise HTTPBadRequestError("Invalid encoding in request body")
+        return self._body_text if self._body_bytes else None
+
+    @property
+    def body_bytes(self) -> Optional[bytes]:
+        """The raw request body bytes, exactly as received."""
+        return self._body_bytes
 
     def get_header(self, name: str, default: Optional[str] = None) -> Optional[str]:
-        """Gets a header value by name (case-insensitive)."""
-        return self.headers.get(name.lower(), default)
+        """Gets a header value by name (case-insensitive).
+
+        Values are stored as bytes and decoded only here, on demand; the
+        decoded str is memoized per request for repeated lookups.
+        """
+        key = _normalize_header_name(name)
+        decoded = self._decoded_headers.get(key)
+        if decoded is not None:
+            return decoded
+        value = self.headers.get(key)
+        if value is None:
+            return default
+        decoded = value.decode('latin-1')
+        self._decoded_headers[key] = decoded
+        return decoded
+
+    def get_header_bytes(self, name: str, default: Optional[bytes] = None) -> Optional[bytes]:
+        """Gets a raw header value by name (case-insensitive), without decoding."""
+        value = self.headers.get(_normalize_header_name(name))
+        return value if value is not None else default
 
     @property
     def should_close_connection(self) -> bool:
         """Checks if the 'Connection: close' header is present."""
-        return self.get_header(HTTPHeader.CONNECTION, "").lower() == "close"
+        value = self.headers.get(b"connection")
+        if value is None:
+            return False
+        # Clients send the token lowercase in practice; only fall back to
+        # a case-folding compare when the exact match misses
+        return value == b"close" or value.lower() == b"close"
 
     def __repr__(self) -> str:
-        return f"HTTPRequest(method={self.method}, path='{self.path}', headers={self.headers}, body_len={len(self.body) if self.body else 0})" 
\ No newline at end of file
+        return f"HTTPRequest(method={self.method}, path='{self.path}', headers={self.headers}, body_len={len(self._body_bytes) if self._body_bytes else 0})"
@@ -1,5 +1,33 @@
+import asyncio
+import os
+import socket
+from functools import lru_cache
 from typing import Dict, Optional, Union
-from .constants import HTTPStatus, STATUS_TEXT, CRLF, PROTOCOL_VERSION, HTTPHeader
+from .constants import (HTTPStatus, STATUS_TEXT, CRLF, PROTOCOL_VERSION,
+                        ContentType, HTTPHeader)
+
+# Encoded status lines, reused across responses so the hot path never
+# re-formats "HTTP/1.1 200 OK\r\n" and friends. All canonical status/text
+# pairs are rendered at import time; custom status_text values are added
+# lazily on first use.
+_STATUS_LINE_CACHE: Dict[tuple, bytes] = {
+    (code, text): f"{PROTOCOL_VERSION} {code.value} {text}{CRLF}".encode('ascii')
+    for code, text in STATUS_TEXT.items()
+}
+
+# Constant header line appended to responses on closing connections; encoded
+# once here instead of being injected into each response's headers dict
+_CONNECTION_CLOSE_LINE = f"{HTTPHeader.CONNECTION}: close{CRLF}".encode('ascii')
+
+@lru_cache(maxsize=256)
+def _header_line(key: str, value: str) -> bytes:
+    """Encodes one 'Key: value\\r\\n' line, memoized per distinct pair.
+
+    Most responses carry the same few header pairs (Content-Type and a
+    handful of Content-Length values), so rendering becomes a cache hit
+    instead of two encodes and a join of four fragments.
+    """
+    return f"{key}: {value}{CRLF}".encode('ascii')
 
 class HTTPResponse:
     """Represents an HTTP response to be sent."""
@@ -22,6 +50,27 @@ class HTTPResponse:
             if self._encoded_body is not None:
                 self.headers[HTTPHeader.CONTENT_LENGTH] = str(len(self._encoded_body))
 
+    @classmethod
+    def from_body_bytes(cls,
+                        status_code: HTTPStatus,
+                        headers: Optional[Dict[str, str]] = None,
+                        body: bytes = b"") -> "HTTPResponse":
+        """Builds a response around an already-encoded body.
+
+        Fast path for handlers that produce bytes directly: skips
+        _encode_body and the case-insensitive Content-Length probe in
+        __init__ (an O(headers) set comprehension), setting the length
+        header in one assignment instead.
+        """
+        response = cls.__new__(cls)
+        response.status_code = status_code
+        response.status_text = STATUS_TEXT.get(status_code, "Unknown")
+        response.headers = headers if headers is not None else {}
+        response.body = body
+        response._encoded_body = body
+        response.headers[HTTPHeader.CONTENT_LENGTH] = str(len(body))
+        return response
+
     def _encode_body(self):
         """Encodes the body to bytes if it isn't already."""
         if self.body is None:
@@ -38,31 +87,255 @@ class HTTPResponse:
             # Handle other potential types if necessary, or raise error
             self._encoded_body = str(self.body).encode('utf-8', 'replace')
 
+    def _render_header_bytes(self, close_connection: bool = False) -> bytes:
+        """Renders the status line and header block (through the blank line)."""
+        cache_key = (self.status_code, self.status_text)
+        response_line = _STATUS_LINE_CACHE.get(cache_key)
+        if response_line is None:
+            response_line = _STATUS_LINE_CACHE.setdefault(
+                cache_key,
+                f"{PROTOCOL_VERSION} {self.status_code.value} {self.status_text}{CRLF}".encode('ascii')
+            )
+
+        # Collect fragments and join once, instead of repeated str/bytes
+        # concatenation (O(N^2) bytes moved for N headers)
+        parts = [response_line]
+        for key, value in self.headers.items():
+            parts.append(_header_line(key, value))
+        # Append the pre-encoded Connection line when closing, rather than
+        # mutating (and re-encoding from) the headers dict
+        if close_connection and HTTPHeader.CONNECTION not in self.headers:
+            parts.append(_CONNECTION_CLOSE_LINE)
+        parts.append(b"\r\n") # End of headers
+        return b"".join(parts)
+
     def to_bytes(self, close_connection: bool = False) -> bytes:
         """Builds the full HTTP response as bytes."""
         # Ensure body is encoded
         if self._encoded_body is None:
             self._encode_body()
 
-        response_line = f"{PROTOCOL_VERSION} {self.status_code.value} {self.status_text}{CRLF}"
+        header_bytes = self._render_header_bytes(close_connection=close_connection)
+        if self._encoded_body:
+            return header_bytes + self._encoded_body
+        return header_bytes
 
-        # Add Connection header if closing
-        if close_connection:
-            # Use canonical header name for consistency
-            self.headers[HTTPHeader.CONNECTION] = "close"
+    def write_to(self, sock, close_connection: bool = False):
+        """Writes the response to a socket without concatenating the body.
 
-        response_headers = ""
-        for key, value in self.headers.items():
-            response_headers += f"{key}: {value}{CRLF}"
+        sendmsg hands header and body to the kernel as one scatter-gather
+        write (writev under the hood): one syscall, and no body-sized
+        intermediate bytes object like to_bytes + sendall would create.
+        """
+        if self._encoded_body is None:
+            self._encode_body()
 
-        headers_part = response_headers + CRLF # End of headers
+        header_bytes = self._render_header_bytes(close_connection=close_connection)
+        if self._encoded_body:
+            sent = sock.sendmsg([header_bytes, self._encoded_body])
+            total = len(header_bytes) + len(self._encoded_body)
+            if sent < total:
+                # Rare partial write (kernel buffer full); finish with sendall
+                sock.sendall((header_bytes + self._encoded_body)[sent:])
+        else:
+            sock.sendall(header_bytes)
 
-        response = response_line.encode('ascii') + headers_part.encode('ascii')
+    async def write_to_stream(self, writer, close_connection: bool = False):
+        """Writes the response through an asyncio StreamWriter.
 
+        Header and body are handed to the transport as separate writes, so
+        no header+body concatenation (and its body-sized copy) happens in
+        Python; the transport coalesces them on flush.
+        """
+        if self._encoded_body is None:
+            self._encode_body()
+        writer.write(self._render_header_bytes(close_connection=close_connection))
         if self._encoded_body:
-            response += self._encoded_body
+            writer.write(self._encoded_body)
+        await writer.drain()
 
-        return response
+    def __repr__(self) -> str:
+        return f"HTTPResponse(status={self.status_code}, headers={self.headers}, body_len={len(self._encoded_body) if self._encoded_body else 0})"
+
+
+class FileResponse(HTTPResponse):
+    """An HTTPResponse whose body is streamed straight from a file.
+
+    The send path writes the header block and then hands the open file to
+    socket.sendfile, which uses the sendfile(2) syscall on Linux to splice
+    page-cache pages directly into the TCP stack — the body never passes
+    through a Python bytes object.
+    """
+
+    def __init__(self,
+                 status_code: HTTPStatus,
+                 file_path: str,
+                 size: int,
+                 headers: Optional[Dict[str, str]] = None,
+                 status_text: Optional[str] = None,
+                 fd: Optional[int] = None):
+        """Initializes a FileResponse for the given file path and size.
+
+        When `fd` is given the body is sent from that already-open
+        descriptor (ownership transfers to this response, which closes it
+        on send); otherwise the path is opened at send time.
+        """
+        headers = dict(headers) if headers is not None else {}
+        headers[HTTPHeader.CONTENT_LENGTH] = str(size)
+        super().__init__(status_code, headers=headers, body=None, status_text=status_text)
+        self.file_path = file_path
+        self.size = size
+        self.fd = fd
+
+    def _open_body(self):
+        """Opens the body source: the handed-over fd, or the path."""
+        if self.fd is not None:
+            fd, self.fd = self.fd, None
+            return open(fd, "rb", closefd=True)
+        return open(self.file_path, "rb")
+
+    def close(self):
+        """Releases the handed-over fd if the body was never sent.
+
+        Safe to call any number of times; a no-op once the fd has been
+        consumed by a send path (the wrapping file object closes it).
+        """
+        if self.fd is not None:
+            fd, self.fd = self.fd, None
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def __del__(self):
+        # Safety net for responses that are built but never sent (e.g. the
+        # header write fails, or the connection loop drops the response):
+        # without it the raw fd would outlive the object
+        self.close()
+
+    # TCP_CORK is Linux-only; None disables the corking below elsewhere
+    _TCP_CORK = getattr(socket, "TCP_CORK", None)
+
+    def write_to(self, sock, close_connection: bool = False):
+        """Writes headers to the socket, then splices the file body.
+
+        Header sendall and sendfile are unavoidably two writes; corking
+        around the pair stops the kernel emitting an undersized
+        header-only segment before the body starts (TCP_NODELAY is set on
+        these sockets, so without the cork it would go out immediately).
+        """
+        try:
+            corked = self._TCP_CORK is not None
+            if corked:
+                try:
+                    sock.setsockopt(socket.IPPROTO_TCP, self._TCP_CORK, 1)
+                except OSError:
+                    corked = False # Not a TCP socket; send uncorked
+            try:
+                sock.sendall(self._render_header_bytes(close_connection=close_connection))
+                with self._open_body() as f:
+                    sock.sendfile(f)
+            finally:
+                if corked:
+                    sock.setsockopt(socket.IPPROTO_TCP, self._TCP_CORK, 0)
+        finally:
+            # Outermost so the fd is released even when the header write or
+            # the uncork raises before/after the body was consumed
+            self.close()
+
+    async def write_to_stream(self, writer, close_connection: bool = False):
+        """Writes the response through an asyncio StreamWriter.
+
+        The event loop's sendfile uses the same sendfile(2) splice as the
+        socket path when the transport supports it; fallback=True degrades
+        to chunked reads for transports that do not (e.g. SSL).
+        """
+        try:
+            writer.write(self._render_header_bytes(close_connection=close_connection))
+            await writer.drain()
+            loop = asyncio.get_running_loop()
+            with self._open_body() as f:
+                await loop.sendfile(writer.transport, f, fallback=True)
+        finally:
+            self.close() # No-op unless the fd was never consumed
+
+    def to_bytes(self, close_connection: bool = False) -> bytes:
+        """Fallback serialization reading the file into memory.
+
+        Used by transports that do not expose a raw socket (e.g. the
+        asyncio backend's StreamWriter).
+        """
+        try:
+            header_bytes = super().to_bytes(close_connection=close_connection)
+            with self._open_body() as f:
+                return header_bytes + f.read()
+        finally:
+            self.close() # No-op unless the fd was never consumed
 
     def __repr__(self) -> str:
-        return f"HTTPResponse(status={self.status_code}, headers={self.headers}, body_len={len(self._encoded_body) if self._encoded_body else 0})" 
\ No newline at end of file
+        return f"FileResponse(status={self.status_code}, file='{self.file_path}', size={self.size})"
+
+
+class PlainTextResponse(HTTPResponse):
+    """A 200 text/plain response built from a precomputed header template.
+
+    The echo and user-agent routes dominate small-request benchmarks and
+    always produce the same header shape; everything up to the
+    Content-Length value is a frozen prefix, so per-request rendering is
+    one int-to-bytes conversion and one small join instead of the generic
+    dict iteration in _render_header_bytes.
+    """
+
+    # "HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\nContent-Length: "
+    _PREFIX = (
+        _STATUS_LINE_CACHE[(HTTPStatus.OK, STATUS_TEXT[HTTPStatus.OK])]
+        + f"{HTTPHeader.CONTENT_TYPE}: {ContentType.TEXT_PLAIN}{CRLF}".encode('ascii')
+        + f"{HTTPHeader.CONTENT_LENGTH}: ".encode('ascii')
+    )
+    # Shared for introspection/__repr__ only; rendering never reads it
+    _HEADERS = {HTTPHeader.CONTENT_TYPE: ContentType.TEXT_PLAIN}
+
+    def __init__(self, body: bytes):
+        """Initializes a 200 text/plain response around encoded body bytes."""
+        self.status_code = HTTPStatus.OK
+        self.status_text = STATUS_TEXT[HTTPStatus.OK]
+        self.headers = self._HEADERS
+        self.body = body
+        self._encoded_body = body
+        self._head = b"%s%d\r\n" % (self._PREFIX, len(body))
+
+    def _render_header_bytes(self, close_connection: bool = False) -> bytes:
+        """Renders the templated header block (through the blank line)."""
+        if close_connection:
+            return self._head + _CONNECTION_CLOSE_LINE + b"\r\n"
+        return self._head + b"\r\n"
+
+
+class PrecomputedResponse(HTTPResponse):
+    """An HTTPResponse whose serialized bytes are computed once and frozen.
+
+    Intended for constant responses (e.g. the empty 200 for '/' and the
+    default 404) that are returned on every matching request: both the
+    keep-alive and the Connection-close variants are rendered at
+    construction time, so to_bytes is a dict lookup instead of a rebuild.
+    Instances are shared across connections and must not be mutated.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initializes the response and precomputes both wire variants."""
+        super().__init__(*args, **kwargs)
+        self._precomputed = {False: super().to_bytes(close_connection=False),
+                             True: super().to_bytes(close_connection=True)}
+
+    def to_bytes(self, close_connection: bool = False) -> bytes:
+        """Returns the frozen response bytes for the requested variant."""
+        return self._precomputed[close_connection]
+
+    def write_to(self, sock, close_connection: bool = False):
+        """Writes the frozen response bytes in one sendall."""
+        sock.sendall(self._precomputed[close_connection])
+
+    async def write_to_stream(self, writer, close_connection: bool = False):
+        """Writes the frozen response bytes in one transport write."""
+        writer.write(self._precomputed[close_connection])
+        await writer.drain() 
\ No newline at end of file
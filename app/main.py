@@ -1,14 +1,37 @@
-import sys
 import argparse
-import logging # Use logging configured in server.py
+import logging
+import logging.handlers
+import queue
 
 from .server import HTTPServer
+from .async_server import AsyncHTTPServer
 from .router import Router
 from .constants import HTTPMethod, DEFAULT_PORT, DEFAULT_ADDRESS
 from . import handlers # Import handlers module
 
+def _configure_logging() -> logging.handlers.QueueListener:
+    """Routes all log records through a queue to a dedicated flush thread.
+
+    Request-handling threads only enqueue records (no formatting, no
+    blocking write(2) under the stdout lock); the QueueListener formats
+    and emits them off the hot path.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(threadName)s - %(levelname)s - %(message)s'))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    listener.start()
+    return listener
+
 def main():
     """Parses arguments, sets up routes, and starts the HTTP server."""
+    _configure_logging()
     parser = argparse.ArgumentParser(description="Basic HTTP Server")
     parser.add_argument(
         "--directory",
@@ -28,6 +51,13 @@ def main():
         help=f"Host to bind to (default: {DEFAULT_ADDRESS})",
         default=DEFAULT_ADDRESS
     )
+    parser.add_argument(
+        "--backend",
+        type=str,
+        choices=["thread", "asyncio"],
+        help="Concurrency backend: one thread per connection, or a single asyncio event loop (default: thread)",
+        default="thread"
+    )
     args = parser.parse_args()
 
     # Create a router and add routes
@@ -40,15 +70,16 @@ def main():
     router.add_route(HTTPMethod.GET, r"/files/.*", handlers.handle_file_get) # Regex for /files/*
     router.add_route(HTTPMethod.POST, r"/files/.*", handlers.handle_file_post) # Regex for /files/*
 
-    # Instantiate and start the server
-    server = HTTPServer(
+    # Instantiate and start the server using the selected backend
+    server_class = AsyncHTTPServer if args.backend == "asyncio" else HTTPServer
+    server = server_class(
         host=args.host,
         port=args.port,
         directory=args.directory,
         router=router
     )
 
-    logging.info(f"Starting server with config: host={args.host}, port={args.port}, directory={args.directory}")
+    logging.info(f"Starting server with config: host={args.host}, port={args.port}, directory={args.directory}, backend={args.backend}")
     server.start() # start() includes the main loop and shutdown handling
 
 if __name__ == "__main__":
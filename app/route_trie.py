@@ -0,0 +1,86 @@
+from typing import Callable, Dict, Optional, Tuple
+
+# Characters that give a pattern regex semantics; a literal must have none
+# (re.escape is too eager here — it escapes '-' and '#', which are plain
+# characters in a path)
+_REGEX_METACHARS = frozenset(".^$*+?()[]{}|\\")
+
+class _TrieNode:
+    """One path segment in the route trie."""
+
+    __slots__ = ("children", "handlers", "prefix_handlers")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        # Routes ending exactly at this node, keyed by method
+        self.handlers: Dict[object, Callable] = {}
+        # Prefix routes ('<literal>.*'): (partial last segment, handler)
+        self.prefix_handlers: Dict[object, Tuple[str, Callable]] = {}
+
+
+class RouteTrie:
+    """Segment-trie dispatch for literal and literal-prefix routes.
+
+    The regex union dispatch costs one C-level match per request; for the
+    common case — routes that are plain literals ('/user-agent') or a
+    literal followed by '.*' ('/files/.*') — a trie walk over the path
+    segments is a handful of dict hits and allocates nothing but the
+    split list. Patterns that use real regex syntax are simply not
+    inserted and keep going through the regex path.
+    """
+
+    def __init__(self):
+        self._root = _TrieNode()
+
+    @staticmethod
+    def classify(path_pattern: str) -> Optional[Tuple[str, bool]]:
+        """Splits a route pattern into (literal, is_prefix) if trie-able.
+
+        Accepts '<literal>$' (exact) and '<literal>.*' (prefix) where the
+        literal contains no regex metacharacters; returns None for
+        anything else so the caller leaves it to the regex dispatch.
+        """
+        if path_pattern.endswith(".*"):
+            literal, is_prefix = path_pattern[:-2], True
+        elif path_pattern.endswith("$"):
+            literal, is_prefix = path_pattern[:-1], False
+        else:
+            literal, is_prefix = path_pattern, False
+        if not _REGEX_METACHARS.isdisjoint(literal):
+            return None
+        return literal, is_prefix
+
+    def insert(self, method, literal: str, is_prefix: bool, handler: Callable):
+        """Inserts a classified route for the given method."""
+        parts = literal.split("/")
+        node = self._root
+        if is_prefix:
+            # All but the last part are exact segments; the last is a
+            # partial segment matched by startswith at lookup time
+            for segment in parts[:-1]:
+                node = node.children.setdefault(segment, _TrieNode())
+            node.prefix_handlers[method] = (parts[-1], handler)
+        else:
+            for segment in parts:
+                node = node.children.setdefault(segment, _TrieNode())
+            node.handlers[method] = handler
+
+    def find(self, method, path: str) -> Optional[Callable]:
+        """Walks the path's segments; returns a handler or None.
+
+        A None result only means the trie has no opinion — the caller
+        falls through to the regex dispatch (and its 405 handling).
+        """
+        node = self._root
+        best = None
+        for segment in path.split("/"):
+            entry = node.prefix_handlers.get(method)
+            if entry is not None and segment.startswith(entry[0]):
+                # '.*' spans slashes, so this stays valid however deep
+                # the walk continues
+                best = entry[1]
+            child = node.children.get(segment)
+            if child is None:
+                return best
+            node = child
+        return node.handlers.get(method, best)
@@ -1,5 +1,3 @@
-# Will be populated later 
-
 import re
 from typing import Callable, List, Tuple, Optional, Pattern
 
@@ -7,6 +5,7 @@ from .http_request import HTTPRequest
 from .http_response import HTTPResponse
 from .constants import HTTPMethod
 from .handlers import handle_not_found # Default fallback handler
+from .route_trie import RouteTrie
 from .exceptions import HTTPMethodNotAllowedError
 
 # Type alias for the handler function signature
@@ -22,6 +21,11 @@ class Router:
         """Initializes the Router with an empty list of routes."""
         self._routes: List[Route] = []
         self.default_handler: HandlerFunction = handle_not_found
+        # Per-method combined dispatch patterns, rebuilt on every add_route
+        self._dispatch: dict = {}
+        # Literal/prefix routes additionally go into a segment trie, which
+        # dispatches them without running the regex engine at all
+        self._trie = RouteTrie()
 
     def add_route(self, method: HTTPMethod, path_pattern: str, handler: HandlerFunction):
         """
@@ -37,6 +41,32 @@ class Router:
         except re.error as e:
             raise ValueError(f"Invalid regex pattern '{path_pattern}': {e}") from e
         self._routes.append((method, compiled_pattern, handler))
+        classified = RouteTrie.classify(path_pattern)
+        if classified is not None:
+            self._trie.insert(method, classified[0], classified[1], handler)
+        # Rebuild eagerly: routes are registered once at startup, so paying
+        # the combine here keeps the per-request path free of lazy-init checks
+        self._build_dispatch()
+
+    def _build_dispatch(self):
+        """Combines each method's route patterns into one alternation regex.
+
+        Matching one compiled alternation is a single C-level call, versus
+        one Python-level Pattern.match per registered route. Each
+        alternative is wrapped in a named group that maps back to its
+        handler via match.lastgroup.
+        """
+        dispatch = {}
+        by_method: dict = {}
+        for route_method, path_regex, handler in self._routes:
+            by_method.setdefault(route_method, []).append((path_regex, handler))
+        for route_method, entries in by_method.items():
+            combined = re.compile(
+                "|".join(f"(?P<r{i}>{p.pattern})" for i, (p, _) in enumerate(entries))
+            )
+            handler_map = {f"r{i}": h for i, (_, h) in enumerate(entries)}
+            dispatch[route_method] = (combined, handler_map)
+        self._dispatch = dispatch
 
     def find_handler(self, request: HTTPRequest) -> HandlerFunction:
         """
@@ -52,6 +82,21 @@ class Router:
             HTTPMethodNotAllowedError: If a route matches the path but not the method.
             HTTPNotFoundError: Implicitly, if no route matches (returns default handler).
         """
+        # Fastest path: literal/prefix routes resolve with a trie walk
+        handler = self._trie.find(request.method, request.path)
+        if handler is not None:
+            return handler
+
+        # Fast path: one combined-regex match for the request's method
+        entry = self._dispatch.get(request.method)
+        if entry:
+            combined, handler_map = entry
+            match = combined.match(request.path)
+            if match and match.lastgroup in handler_map:
+                return handler_map[match.lastgroup]
+
+        # Slow path: linear scan, needed to distinguish 405 from 404 (and as
+        # a fallback for route patterns that define their own groups)
         allowed_methods = set()
         path_matched = False
 
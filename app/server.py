@@ -1,25 +1,58 @@
-# Will be populated later 
-
+import os
+import selectors
 import socket
-import threading
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
-from .constants import DEFAULT_ADDRESS, DEFAULT_PORT, RECV_BUFFER_SIZE, SOCKET_TIMEOUT
+from .constants import (DEFAULT_ADDRESS, DEFAULT_PORT, DEFAULT_MAX_WORKERS,
+                        MAX_REQUEST_SIZE, RECV_BUFFER_SIZE, SOCKET_TIMEOUT)
 from .http_request import HTTPRequest
 from .http_response import HTTPResponse
 from .router import Router
-from .exceptions import HTTPException, HTTPInternalServerError
+from .exceptions import (HTTPException, HTTPBadRequestError,
+                         HTTPInternalServerError, HTTPPayloadTooLargeError)
+
+def _content_length_of(header_block: bytes) -> int:
+    """Extracts the Content-Length value from a raw header block (0 if absent)."""
+    for line in header_block.split(b"\r\n")[1:]:
+        name, sep, value = line.partition(b":")
+        if sep and name.strip().lower() == b"content-length":
+            try:
+                return int(value.strip().decode('ascii'))
+            except (ValueError, UnicodeDecodeError):
+                raise HTTPBadRequestError(f"Invalid Content-Length: {value!r}")
+    return 0
+
+# Logging is configured by the entry point (see main._configure_logging);
+# importing this module must not install handlers on the root logger
+
+class _ConnectionState:
+    """Per-connection state that survives parking in the idle selector.
 
-# Configure basic logging
-logging.basicConfig(level=logging.INFO,
-                    format='%(asctime)s - %(threadName)s - %(levelname)s - %(message)s')
+    While a keep-alive connection waits for its next request it holds no
+    worker thread — only this object, its socket, and a selector
+    registration. The receive buffer and residual byte count move with it
+    so pipelined data is not lost across a park/resume cycle.
+    """
+
+    __slots__ = ("sock", "peername", "recv_buffer", "buffered", "deadline")
+
+    def __init__(self, sock: socket.socket, peername: str):
+        self.sock = sock
+        self.peername = peername
+        self.recv_buffer = bytearray(RECV_BUFFER_SIZE)
+        self.buffered = 0
+        self.deadline = 0.0
 
 class HTTPServer:
     """A basic HTTP/1.1 server supporting persistent connections."""
 
     def __init__(self, host: str = DEFAULT_ADDRESS, port: int = DEFAULT_PORT,
-                 directory: Optional[str] = None, router: Optional[Router] = None):
+                 directory: Optional[str] = None, router: Optional[Router] = None,
+                 max_workers: int = DEFAULT_MAX_WORKERS):
         """Initializes the HTTP server.
 
         Args:
@@ -27,24 +60,155 @@ class HTTPServer:
             port: The port number to bind to.
             directory: The directory to serve files from (passed to handlers).
             router: A Router instance. If None, a default router is created.
+            max_workers: Maximum number of concurrent connection-handling threads.
         """
         self.host = host
         self.port = port
         self.directory = directory
         self.router = router if router is not None else Router() # Use provided or default router
+        self.max_workers = max_workers
         self._server_socket: Optional[socket.socket] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
         self._is_running = False
+        # Connections currently being handled; used to detect saturation
+        self._active_connections = 0
+        self._active_lock = threading.Lock()
+        # Idle keep-alive connections are parked here instead of holding a
+        # blocked worker thread; one reactor thread watches them all
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._selector_lock = threading.Lock()
+        self._reactor_thread: Optional[threading.Thread] = None
+        self._waker_r = -1
+        self._waker_w = -1
 
         if directory:
             logging.info(f"Serving files from directory: {directory}")
         else:
             logging.warning("No --directory specified. File serving handlers might fail.")
 
+    def _recv_request(self, client_socket: socket.socket, recv_buffer: bytearray,
+                      size: int) -> tuple:
+        """Receives one complete HTTP request from the socket.
+
+        A single recv only returns whatever happens to be in the kernel
+        buffer; requests whose headers or body span multiple TCP segments
+        (e.g. large POSTs) need accumulation. Reads until the header
+        terminator is seen, then until Content-Length body bytes have
+        arrived.
+
+        recv_buffer is owned by the connection and reused across its
+        requests: recv_into fills it in place (no fresh bytes object per
+        recv) and it only grows, never shrinks, for the connection's
+        lifetime. `size` is the number of residual bytes already buffered
+        from the previous call — a pipelining client may pack several
+        requests into one segment, and those must be served from the
+        buffer without forcing another recv syscall.
+
+        Returns (request_bytes, residual_size): exactly one request's
+        bytes, with any following pipelined bytes shifted to the front of
+        recv_buffer and their count returned. request_bytes is b'' if the
+        client closed before sending anything.
+        """
+        # The residual may already hold a full header block; scan it before
+        # touching the socket
+        header_end = recv_buffer.find(b"\r\n\r\n", 0, size) if size else -1
+        while header_end == -1:
+            if size == len(recv_buffer):
+                recv_buffer.extend(bytes(len(recv_buffer))) # Double when full
+            n = client_socket.recv_into(memoryview(recv_buffer)[size:])
+            if n == 0:
+                # EOF: hand back whatever arrived (may be a partial request)
+                return bytes(recv_buffer[:size]), 0
+            size += n
+            # Only rescan the tail (terminator may straddle the chunk edge)
+            header_end = recv_buffer.find(b"\r\n\r\n", max(0, size - n - 3), size)
+            if size > MAX_REQUEST_SIZE and header_end == -1:
+                raise HTTPPayloadTooLargeError("Request headers too large.")
+
+        total_size = header_end + 4 + _content_length_of(bytes(recv_buffer[:header_end]))
+        if total_size > MAX_REQUEST_SIZE:
+            raise HTTPPayloadTooLargeError("Request body too large.")
+        while size < total_size:
+            if size == len(recv_buffer):
+                recv_buffer.extend(bytes(len(recv_buffer)))
+            n = client_socket.recv_into(memoryview(recv_buffer)[size:])
+            if n == 0:
+                # EOF mid-body; parser will see the truncated request
+                return bytes(recv_buffer[:size]), 0
+            size += n
+
+        request_bytes = bytes(recv_buffer[:total_size])
+        residual = size - total_size
+        if residual:
+            # Shift the next pipelined request(s) to the buffer's front
+            recv_buffer[:residual] = recv_buffer[total_size:size]
+        return request_bytes, residual
+
     def _handle_client_connection(self, client_socket: socket.socket, address: tuple):
-        """Handles a single client connection, potentially multiple requests."""
+        """Entry point for a newly accepted connection."""
         client_socket.settimeout(SOCKET_TIMEOUT)
         peername = f"{address[0]}:{address[1]}"
-        logging.info(f"Connection established with {peername}")
+        logging.debug("Connection established with %s", peername)
+        self._process_connection(_ConnectionState(client_socket, peername))
+
+    def _try_park(self, state: _ConnectionState) -> bool:
+        """Registers an idle keep-alive connection with the selector.
+
+        The owning worker returns to the pool; the reactor resubmits the
+        connection when its socket becomes readable, or closes it when the
+        idle deadline passes. Returns False (caller keeps ownership and
+        closes) if the server is shutting down.
+        """
+        state.deadline = time.monotonic() + SOCKET_TIMEOUT
+        with self._selector_lock:
+            if self._selector is None or not self._is_running:
+                return False
+            try:
+                self._selector.register(state.sock, selectors.EVENT_READ, state)
+            except (ValueError, OSError):
+                return False # Socket already closed under us
+        # Nudge the reactor out of select() so the new fd is watched now
+        os.write(self._waker_w, b"\x00")
+        return True
+
+    def _reactor_loop(self):
+        """Watches parked connections for readability and idle expiry."""
+        while self._is_running:
+            events = self._selector.select(timeout=1.0)
+            for key, _ in events:
+                if key.fd == self._waker_r:
+                    os.read(self._waker_r, 4096) # Drain wakeup bytes
+                    continue
+                state = key.data
+                with self._selector_lock:
+                    try:
+                        self._selector.unregister(key.fileobj)
+                    except (KeyError, ValueError):
+                        continue # Already reclaimed (e.g. by expiry below)
+                try:
+                    self._pool.submit(self._process_connection, state)
+                except RuntimeError:
+                    state.sock.close() # Pool is shutting down
+            # Reap connections idle past their keep-alive deadline
+            now = time.monotonic()
+            with self._selector_lock:
+                expired = [key for key in list(self._selector.get_map().values())
+                           if key.data is not None and key.data.deadline < now]
+                for key in expired:
+                    self._selector.unregister(key.fileobj)
+            for key in expired:
+                logging.debug("Closing idle connection to %s.", key.data.peername)
+                key.data.sock.close()
+
+    def _process_connection(self, state: _ConnectionState):
+        """Serves requests on a connection until it closes or goes idle."""
+        client_socket = state.sock
+        peername = state.peername
+        recv_buffer = state.recv_buffer
+        buffered = state.buffered
+        with self._active_lock:
+            self._active_connections += 1
+        parked = False
 
         try:
             while True: # Keep-Alive loop
@@ -53,18 +217,25 @@ class HTTPServer:
                 close_connection = False
 
                 try:
-                    # Receive data from the client
-                    request_bytes = client_socket.recv(RECV_BUFFER_SIZE)
+                    # Receive one complete request from the client (or pull
+                    # the next pipelined one out of the residual buffer)
+                    request_bytes, buffered = self._recv_request(
+                        client_socket, recv_buffer, buffered)
                     if not request_bytes:
-                        logging.info(f"Client {peername} closed connection.")
+                        logging.debug("Client %s closed connection.", peername)
                         break # Client closed connection gracefully
 
                     # Parse the request
                     request = HTTPRequest.from_bytes(request_bytes)
-                    logging.info(f"Received request from {peername}: {request.method.value} {request.path}")
+                    logging.debug("Received request from %s: %s %s", peername, request.method.value, request.path)
 
-                    # Determine if connection should close after this request
-                    close_connection = request.should_close_connection
+                    # Determine if connection should close after this request.
+                    # When every pool worker is occupied, idle keep-alive
+                    # connections would starve the ones queued behind them;
+                    # under saturation each connection is closed after its
+                    # response so its worker can pick up queued work.
+                    close_connection = (request.should_close_connection
+                                        or self._active_connections >= self.max_workers)
 
                     # Find the appropriate handler using the router
                     handler = self.router.find_handler(request)
@@ -74,25 +245,27 @@ class HTTPServer:
                     response = handler(request, self.directory)
 
                 except socket.timeout:
-                    logging.warning(f"Connection to {peername} timed out.")
+                    logging.warning("Connection to %s timed out.", peername)
                     close_connection = True # Force close on timeout
                     break
-                except ConnectionResetError:
-                    logging.warning(f"Connection to {peername} reset by peer.")
-                    close_connection = True
-                    break
-                except BrokenPipeError:
-                    logging.warning(f"Broken pipe error with {peername}.")
+                except ConnectionError as e:
+                    # Peer went away (reset, broken pipe); nothing to send
+                    logging.warning("Connection error with %s: %s", peername, e)
                     close_connection = True
                     break
                 except HTTPException as e:
                     # Handle known HTTP errors from parsing or handlers
-                    logging.warning(f"HTTP error for {peername}: {e}")
+                    logging.warning("HTTP error for %s: %s", peername, e)
                     response = HTTPResponse(status_code=e.status_code, body=e.message)
-                    # Keep connection open unless client requested close or it's a server error
-                    close_connection = close_connection or e.status_code.value >= 500
+                    # Keep connection open unless the client requested close,
+                    # it's a server error, or framing is unrecoverable (413:
+                    # the unread body would be parsed as garbage requests)
+                    close_connection = (close_connection or e.must_close
+                                        or e.status_code.value >= 500)
                 except Exception as e:
-                    # Handle unexpected errors
+                    # Last-resort guard: a handler bug on a pooled worker
+                    # would otherwise vanish into an unobserved Future and
+                    # the client would hang, so answer 500 and close
                     logging.exception(f"Unexpected error processing request from {peername}: {e}")
                     err_resp = HTTPInternalServerError()
                     response = HTTPResponse(status_code=err_resp.status_code, body=err_resp.message)
@@ -100,9 +273,16 @@ class HTTPServer:
 
                 # Send the response if one was generated
                 if response:
-                    response_bytes = response.to_bytes(close_connection=close_connection)
-                    client_socket.sendall(response_bytes)
-                    logging.info(f"Sent response to {peername}: {response.status_code.value} {response.status_text}")
+                    try:
+                        # Each response type knows its own optimal send strategy
+                        # (sendmsg scatter-gather, sendfile, or a frozen blob)
+                        response.write_to(client_socket, close_connection=close_connection)
+                    except (ConnectionError, socket.timeout) as e:
+                        # Peer vanished mid-send; previously this escaped
+                        # into the pool's Future unobserved
+                        logging.warning("Send to %s failed: %s", peername, e)
+                        break
+                    logging.debug("Sent response to %s: %s %s", peername, response.status_code.value, response.status_text)
                 elif not close_connection:
                     # If no response and connection not closing, something is wrong (e.g., timeout without response)
                     # We should probably close to be safe
@@ -111,40 +291,70 @@ class HTTPServer:
 
                 # Close connection if flagged
                 if close_connection:
-                    logging.info(f"Closing connection to {peername}.")
+                    logging.debug("Closing connection to %s.", peername)
                     break
 
+                # Residual pipelined bytes: keep the worker and serve them
+                if buffered:
+                    continue
+
+                # Idle keep-alive: park the socket with the reactor and
+                # give this thread back to the pool
+                state.recv_buffer = recv_buffer
+                state.buffered = 0
+                if self._try_park(state):
+                    parked = True
+                    return
+
         finally:
-            if not client_socket._closed:
+            with self._active_lock:
+                self._active_connections -= 1
+            if not parked and not client_socket._closed:
                 try:
                     client_socket.shutdown(socket.SHUT_RDWR)
                 except OSError:
                     pass # Ignore if already closed
                 client_socket.close()
-                logging.debug(f"Socket for {peername} closed.")
+                logging.debug("Socket for %s closed.", peername)
 
     def start(self):
-        """Starts the server, listens for connections, and handles them in threads."""
+        """Starts the server, listens for connections, and handles them in a thread pool."""
         try:
             # SO_REUSEPORT allows multiple instances on the same port (useful for testing/dev)
             # SO_REUSEADDR allows reusing the address quickly after server stops
-            self._server_socket = socket.create_server((self.host, self.port), reuse_port=True)
-            # self._server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            # A full listen backlog lets connection bursts queue in the kernel
+            # instead of being refused while workers catch up
+            self._server_socket = socket.create_server(
+                (self.host, self.port), reuse_port=True, backlog=socket.SOMAXCONN)
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="http-worker")
             self._is_running = True
+            # Reactor for parked keep-alive sockets; the self-pipe lets
+            # workers wake it when they register a new fd
+            self._selector = selectors.DefaultSelector()
+            self._waker_r, self._waker_w = os.pipe()
+            self._selector.register(self._waker_r, selectors.EVENT_READ)
+            self._reactor_thread = threading.Thread(
+                target=self._reactor_loop, name="http-reactor", daemon=True)
+            self._reactor_thread.start()
             logging.info(f"Server started on {self.host}:{self.port}")
 
             while self._is_running:
                 try:
                     client_socket, address = self._server_socket.accept()
-                    # Start a new thread to handle the client connection
-                    # Use daemon=True so threads don't block program exit
-                    thread = threading.Thread(
-                        target=self._handle_client_connection,
-                        args=(client_socket, address),
-                        daemon=True,
-                        name=f"Client-{address[0]}:{address[1]}"
-                    )
-                    thread.start()
+                    # Disable Nagle: responses here are small header+body
+                    # writes, and coalescing them behind unACKed data adds
+                    # up to ~40ms latency for nothing
+                    client_socket.setsockopt(
+                        socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    # Hand the connection to a pooled worker; threads are
+                    # reused across connections and bounded by max_workers
+                    try:
+                        self._pool.submit(self._handle_client_connection,
+                                          client_socket, address)
+                    except RuntimeError:
+                        # Pool is shutting down; refuse the connection
+                        client_socket.close()
                 except OSError as e:
                     # Handle cases where the socket might be closed while accept() is blocking
                     if self._is_running:
@@ -163,11 +373,27 @@ class HTTPServer:
     def stop(self):
         """Stops the server and closes the server socket."""
         self._is_running = False
+        if self._reactor_thread:
+            os.write(self._waker_w, b"\x00") # Wake the reactor so it exits
+            self._reactor_thread.join(timeout=2)
+            self._reactor_thread = None
+        if self._selector:
+            with self._selector_lock:
+                # Close any still-parked connections along with the selector
+                for key in list(self._selector.get_map().values()):
+                    if key.data is not None:
+                        key.data.sock.close()
+                self._selector.close()
+                self._selector = None
+            os.close(self._waker_r)
+            os.close(self._waker_w)
+        if self._pool:
+            # Don't wait for in-flight connections; drop queued ones
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
         if self._server_socket:
             logging.info("Closing server socket...")
             # Close the socket to unblock the accept() call in the main loop
-            # Set socket to non-blocking before closing to avoid potential hangs
-            # self._server_socket.setblocking(False)
             try:
                  self._server_socket.close()
             except OSError as e: